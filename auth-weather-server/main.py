@@ -1,22 +1,59 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import compile_path
+from sqlalchemy import bindparam, or_, select, text
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Dict, NamedTuple
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import hashlib
+import hmac
 import httpx
+import multiprocessing
+import orjson
 import os
+import threading
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import jwt
+from cachetools import TTLCache
 
 from database import SessionLocal, engine, Base
 from models import User
-from schemas import UserCreate, UserResponse, Token, WeatherResponse
+from schemas import UserCreate, UserResponse, Token, WeatherResponse, BatchRequest, BatchRequestItem
+from security import verify_and_update_password, get_password_hash
 
-Base.metadata.create_all(bind=engine)
+SENSOR_SERVICE_URL = "http://sensor-service:8001"
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
 
-app = FastAPI(title="Auth & Weather API")
+# Arbitrary application-wide key for the advisory lock that serializes table creation
+SCHEMA_LOCK_KEY = 7_271_001
+
+def create_tables():
+    """Create missing tables; uvicorn workers start together, so they take turns instead of racing on CREATE TABLE"""
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        Base.metadata.create_all(bind=conn)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create tables, then share pooled keep-alive HTTP clients across all requests"""
+    create_tables()
+    app.state.http = httpx.AsyncClient(base_url=SENSOR_SERVICE_URL, timeout=10.0, limits=HTTP_LIMITS)
+    app.state.weather_http = httpx.AsyncClient(timeout=10.0, limits=HTTP_LIMITS)
+    yield
+    await app.state.http.aclose()
+    await app.state.weather_http.aclose()
+    hash_pool.shutdown()
+
+app = FastAPI(title="Auth & Weather API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,15 +64,58 @@ app.add_middleware(
 )
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
+SECRET_KEY_BYTES = SECRET_KEY.encode()
 ALGORITHM = "HS256"
+ALGORITHMS = [ALGORITHM]
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRES = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+DEFAULT_TOKEN_EXPIRES = timedelta(minutes=15)
 
-pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=12, deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Resolved users keyed by token digest, so repeat requests skip JWT decode + DB lookup
+TOKEN_CACHE_TTL_SECONDS = 30
+token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL_SECONDS)
+token_cache_lock = threading.Lock()
+
+# Users keyed by username; rows barely change within a token's lifetime. Call invalidate_user() on updates.
+USER_CACHE_TTL_SECONDS = 60
+user_cache = TTLCache(maxsize=5000, ttl=USER_CACHE_TTL_SECONDS)
+user_cache_lock = threading.Lock()
+
+class UserLite(NamedTuple):
+    """Detached snapshot of a users row, safe to share between requests"""
+    id: int
+    username: str
+    email: str
+    created_at: datetime
+
+# Core statement built once: skips ORM query construction and instance hydration on the auth path
+USER_LOOKUP = select(User.id, User.username, User.email, User.created_at).where(
+    User.username == bindparam("username")
+)
+
+# Password hashing is CPU-bound; run it in worker processes so login bursts don't starve the threadpool.
+# Spawned (not forked) workers avoid inheriting locks held by the server's threads.
+# By default the cores are split between the uvicorn workers (WEB_CONCURRENCY), so a single
+# worker, as under docker-compose's --reload, still hashes on every core.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", str(max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY))))
+hash_pool = ProcessPoolExecutor(max_workers=HASH_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+# Verified against when the username is unknown so both failure paths cost one hash check
+DUMMY_PASSWORD_HASH = get_password_hash("dummy-password")
+
 WEATHER_API_KEY = os.getenv("WEATHER_API_KEY", "your_api_key_here")
 WEATHER_API_URL = "http://api.openweathermap.org/data/2.5/weather"
 
+# OpenWeatherMap refreshes roughly every 10 minutes, so a short per-city cache saves upstream calls
+WEATHER_CACHE_TTL_SECONDS = 300
+weather_cache = TTLCache(maxsize=1024, ttl=WEATHER_CACHE_TTL_SECONDS)
+# Per-city single-flight locks, with the number of requests holding or waiting on each;
+# a lock is dropped only once that count is back to zero so every waiter shares it
+weather_locks: Dict[str, asyncio.Lock] = {}
+weather_lock_users: Dict[str, int] = {}
+
 def get_db():
     db = SessionLocal()
     try:
@@ -43,406 +123,283 @@ def get_db():
     finally:
         db.close()
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str):
-    return pwd_context.hash(password)
-
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+def create_access_token(data: dict, expires_delta: timedelta = DEFAULT_TOKEN_EXPIRES):
+    # exp is an epoch-seconds claim, so skip building datetime objects
+    expire = int(time.time() + expires_delta.total_seconds())
+    return jwt.encode({**data, "exp": expire}, SECRET_KEY_BYTES, algorithm=ALGORITHM)
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    cache_key = hashlib.sha256(token.encode()).digest()
+    with token_cache_lock:
+        cached = token_cache.get(cache_key)
+    # Entries also carry the token's own expiry so an expired token never outlives its exp claim
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
+        # exp is optional to PyJWT; without "require" a signed token lacking it would never expire.
+        # sub is deliberately not required so a token without one still goes through the lookup below
+        payload = jwt.decode(token, SECRET_KEY_BYTES, algorithms=ALGORITHMS, options={"require": ["exp"]})
+    except jwt.InvalidTokenError:
         raise credentials_exception
-    user = db.query(User).filter(User.username == username).first()
+    # A missing subject still costs a lookup so it fails no faster than an unknown user
+    username = str(payload.get("sub") or "")
+    with user_cache_lock:
+        user = user_cache.get(username)
     if user is None:
+        # Short-lived connection so it is back in the pool before handlers await upstream calls
+        with engine.connect() as conn:
+            row = conn.execute(USER_LOOKUP, {"username": username}).one_or_none()
+        if row is not None:
+            user = UserLite(*row)
+            with user_cache_lock:
+                user_cache[username] = user
+    if user is None or not hmac.compare_digest(user.username.encode(), username.encode()):
         raise credentials_exception
+    with token_cache_lock:
+        token_cache[cache_key] = (user, payload["exp"])
+    return user
+
+def invalidate_user(username: str):
+    """Drop cached lookups for a user whose row changed (password change, deletion)"""
+    with user_cache_lock:
+        user_cache.pop(username, None)
+    with token_cache_lock:
+        for key, (user, _) in list(token_cache.items()):
+            if user.username == username:
+                token_cache.pop(key, None)
+
+def save_user(db: Session, user: User):
+    db.add(user)
+    db.commit()
+    db.refresh(user)
     return user
 
 @app.post("/signup", response_model=UserResponse)
-def signup(user_data: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.username == user_data.username).first()
-    if db_user:
-        raise HTTPException(status_code=400, detail="Username already registered")
-    
-    db_user = db.query(User).filter(User.email == user_data.email).first()
-    if db_user:
+async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+    # Start hashing immediately so it overlaps with the duplicate check
+    hash_future = asyncio.get_running_loop().run_in_executor(
+        hash_pool, get_password_hash, user_data.password
+    )
+    conflict = await run_in_threadpool(
+        lambda: db.query(User.username, User.email).filter(
+            or_(User.username == user_data.username, User.email == user_data.email)
+        ).first()
+    )
+    if conflict:
+        hash_future.cancel()
+        if conflict.username == user_data.username:
+            raise HTTPException(status_code=400, detail="Username already registered")
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = get_password_hash(user_data.password)
     db_user = User(
         username=user_data.username,
         email=user_data.email,
-        hashed_password=hashed_password
+        hashed_password=await hash_future
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return await run_in_threadpool(save_user, db, db_user)
 
 @app.post("/token", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == form_data.username).first()
+    )
+    hashed_password = user.hashed_password if user else DUMMY_PASSWORD_HASH
+    password_valid, new_hash = await asyncio.get_running_loop().run_in_executor(
+        hash_pool, verify_and_update_password, form_data.password, hashed_password
+    )
+    if not user or not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    if new_hash:
+        # Transparently migrate legacy bcrypt hashes to Argon2id on successful login
+        user.hashed_password = new_hash
+        await run_in_threadpool(db.commit)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username}, expires_delta=ACCESS_TOKEN_EXPIRES
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.get("/me", response_model=UserResponse)
-def read_users_me(current_user: User = Depends(get_current_user)):
+def read_users_me(current_user: UserLite = Depends(get_current_user)):
     return current_user
 
-@app.get("/weather", response_model=WeatherResponse)
-async def get_weather(
-    city: str = "London",
-    current_user: User = Depends(get_current_user)
-):
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                WEATHER_API_URL,
-                params={
-                    "q": city,
-                    "appid": WEATHER_API_KEY,
-                    "units": "metric"
-                }
-            )
-            if response.status_code == 401:
-                raise HTTPException(
-                    status_code=401,
-                    detail=f"Weather API authentication failed. Check API key. Status: {response.status_code}"
-                )
-            if response.status_code != 200:
-                error_detail = response.text if hasattr(response, 'text') else "Weather API error"
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Weather API error: {error_detail}"
-                )
-            data = response.json()
-            return WeatherResponse(
-                city=data["name"],
-                temperature=data["main"]["temp"],
-                description=data["weather"][0]["description"],
-                humidity=data["main"]["humidity"],
-                wind_speed=data["wind"]["speed"]
-            )
-    except httpx.RequestError:
-        raise HTTPException(status_code=503, detail="Weather service unavailable")
-
-@app.get("/fields")
-async def get_fields(current_user: User = Depends(get_current_user)):
-    """Get all fields with checkpoints, sensors, and pumps from sensor service"""
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                "http://sensor-service:8001/fields",
-                params={"user_id": current_user.id}
-            )
-            if response.status_code != 200:
-                error_detail = response.text if hasattr(response, 'text') else "Unknown error"
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Failed to fetch fields from sensor service: {error_detail}"
-                )
-            return response.json()
-    except httpx.TimeoutException:
-        raise HTTPException(status_code=503, detail="Sensor service timeout - service may be unavailable")
-    except httpx.ConnectError as e:
-        raise HTTPException(status_code=503, detail=f"Cannot connect to sensor service: {str(e)}")
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Sensor service unavailable: {str(e)}")
+UPSTREAM_ERROR_DETAIL_LIMIT = 512
 
-@app.post("/pumps/{pump_id}/control")
-async def control_pump(
-    pump_id: int,
-    control: dict,
-    current_user: User = Depends(get_current_user)
-):
-    """Control pump on/off via sensor service"""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"http://sensor-service:8001/pumps/{pump_id}/control",
-                json=control
-            )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to control pump"
-                )
-            return response.json()
-    except httpx.RequestError:
-        raise HTTPException(status_code=503, detail="Sensor service unavailable")
+def upstream_error_detail(response: httpx.Response) -> str:
+    """Decode only the head of an upstream error body instead of the whole page"""
+    if not response.content:
+        return "upstream error"
+    return response.content[:UPSTREAM_ERROR_DETAIL_LIMIT].decode("utf-8", "replace")
 
-@app.post("/fields")
-async def create_field(
-    field_data: dict,
-    current_user: User = Depends(get_current_user)
-):
-    """Create a new field via sensor service"""
+async def fetch_weather(client: httpx.AsyncClient, city: str) -> WeatherResponse:
+    """Fetch current weather for a city from OpenWeatherMap"""
     try:
-        async with httpx.AsyncClient() as client:
-            # Add user_id to the field data
-            field_data_with_user = {**field_data, "user_id": current_user.id}
-            response = await client.post(
-                "http://sensor-service:8001/fields",
-                json=field_data_with_user
+        response = await client.get(
+            WEATHER_API_URL,
+            params={
+                "q": city,
+                "appid": WEATHER_API_KEY,
+                "units": "metric"
+            }
+        )
+        if response.status_code == 401:
+            raise HTTPException(
+                status_code=401,
+                detail=f"Weather API authentication failed. Check API key. Status: {response.status_code}"
             )
-            if response.status_code != 201:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to create field"
-                )
-            return response.json()
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Sensor service unavailable: {str(e)}")
-
-@app.put("/fields/{field_id}")
-async def update_field(
-    field_id: int,
-    field_data: dict,
-    current_user: User = Depends(get_current_user)
-):
-    """Update a field via sensor service"""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                f"http://sensor-service:8001/fields/{field_id}",
-                json=field_data,
-                params={"user_id": current_user.id}
+        if response.status_code != 200:
+            error_detail = upstream_error_detail(response)
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Weather API error: {error_detail}"
             )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to update field"
-                )
-            return response.json()
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Sensor service unavailable: {str(e)}")
+        data = response.json()
+        return WeatherResponse(
+            city=data["name"],
+            temperature=data["main"]["temp"],
+            description=data["weather"][0]["description"],
+            humidity=data["main"]["humidity"],
+            wind_speed=data["wind"]["speed"]
+        )
+    except httpx.RequestError:
+        raise HTTPException(status_code=503, detail="Weather service unavailable")
 
-@app.delete("/fields/{field_id}")
-async def delete_field(
-    field_id: int,
-    current_user: User = Depends(get_current_user)
+@app.get("/weather", response_model=WeatherResponse)
+async def get_weather(
+    request: Request,
+    city: str = "London",
+    current_user: UserLite = Depends(get_current_user)
 ):
-    """Delete a field via sensor service"""
+    cache_key = city.lower()
+    weather = weather_cache.get(cache_key)
+    if weather is not None:
+        return weather
+    # Concurrent misses for the same city wait on one upstream fetch
+    lock = weather_locks.setdefault(cache_key, asyncio.Lock())
+    weather_lock_users[cache_key] = weather_lock_users.get(cache_key, 0) + 1
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"http://sensor-service:8001/fields/{field_id}",
-                params={"user_id": current_user.id}
-            )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to delete field"
-                )
-            return response.json()
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Sensor service unavailable: {str(e)}")
+        async with lock:
+            weather = weather_cache.get(cache_key)
+            if weather is None:
+                weather = await fetch_weather(request.app.state.weather_http, city)
+                weather_cache[cache_key] = weather
+            return weather
+    finally:
+        weather_lock_users[cache_key] -= 1
+        if not weather_lock_users[cache_key]:
+            del weather_lock_users[cache_key]
+            del weather_locks[cache_key]
 
-@app.post("/checkpoints")
-async def create_checkpoint(
-    checkpoint_data: dict,
-    current_user: User = Depends(get_current_user)
-):
-    """Create a new checkpoint via sensor service"""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "http://sensor-service:8001/checkpoints",
-                json=checkpoint_data,
-                params={"user_id": current_user.id}
-            )
-            if response.status_code != 201:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to create checkpoint"
-                )
-            return response.json()
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Sensor service unavailable: {str(e)}")
+# Sensor-service routes exposed to authenticated users, forwarded verbatim by proxy_sensor_service
+SENSOR_PROXY_ROUTES = [
+    ("/fields", ["GET", "POST"]),
+    ("/fields/{field_id}", ["PUT", "DELETE"]),
+    ("/pumps/{pump_id}/control", ["POST"]),
+    ("/checkpoints", ["POST"]),
+    ("/checkpoints/{checkpoint_id}", ["PUT", "DELETE"]),
+    ("/trigger-tasks", ["GET", "POST"]),
+    ("/trigger-tasks/{task_id}", ["PUT", "DELETE"]),
+    ("/trigger-tasks/evaluate", ["POST"]),
+    ("/trigger-tasks/{task_id}/evaluate", ["POST"]),
+]
+PROXY_RESPONSE_HEADERS = ("content-type", "content-encoding", "content-length")
 
-@app.put("/checkpoints/{checkpoint_id}")
-async def update_checkpoint(
-    checkpoint_id: int,
-    checkpoint_data: dict,
-    current_user: User = Depends(get_current_user)
-):
-    """Update a checkpoint via sensor service"""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                f"http://sensor-service:8001/checkpoints/{checkpoint_id}",
-                json=checkpoint_data,
-                params={"user_id": current_user.id}
-            )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to update checkpoint"
-                )
-            return response.json()
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Sensor service unavailable: {str(e)}")
+# Parsed once; absolute URLs built from it skip the client's per-request base_url merge
+SENSOR_BASE_URL = httpx.URL(SENSOR_SERVICE_URL)
+SENSOR_REQUEST_HEADERS = {"content-type": "application/json"}
 
-@app.delete("/checkpoints/{checkpoint_id}")
-async def delete_checkpoint(
-    checkpoint_id: int,
-    current_user: User = Depends(get_current_user)
-):
-    """Delete a checkpoint via sensor service"""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"http://sensor-service:8001/checkpoints/{checkpoint_id}",
-                params={"user_id": current_user.id}
-            )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to delete checkpoint"
-                )
-            return response.json()
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Sensor service unavailable: {str(e)}")
+def build_sensor_request(
+    client: httpx.AsyncClient, method: str, path: str, query, user_id: int, content: bytes
+) -> httpx.Request:
+    """Build a sensor-service request scoped to user_id, which callers can never override"""
+    params = httpx.QueryParams(query).set("user_id", user_id)
+    url = SENSOR_BASE_URL.copy_with(path=path, query=str(params).encode())
+    return client.build_request(method, url, content=content, headers=SENSOR_REQUEST_HEADERS)
 
-@app.get("/trigger-tasks")
-async def get_trigger_tasks(
-    field_id: Optional[int] = None,
-    current_user: User = Depends(get_current_user)
-):
-    """Get trigger tasks via sensor service"""
+async def proxy_sensor_service(request: Request, current_user: UserLite = Depends(get_current_user)):
+    """Forward a request to the sensor service and stream its response back unparsed"""
+    client = request.app.state.http
+    upstream_request = build_sensor_request(
+        client,
+        request.method,
+        request.url.path,
+        request.url.query,
+        current_user.id,
+        await request.body(),
+    )
     try:
-        async with httpx.AsyncClient() as client:
-            params = {"user_id": current_user.id}
-            if field_id:
-                params["field_id"] = field_id
-            response = await client.get(
-                "http://sensor-service:8001/trigger-tasks",
-                params=params
-            )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to get trigger tasks"
-                )
-            return response.json()
+        response = await client.send(upstream_request, stream=True)
     except httpx.RequestError as e:
         raise HTTPException(status_code=503, detail=f"Sensor service unavailable: {str(e)}")
+    return StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        headers={name: response.headers[name] for name in PROXY_RESPONSE_HEADERS if name in response.headers},
+        background=BackgroundTask(response.aclose),
+    )
 
-@app.post("/trigger-tasks")
-async def create_trigger_task(
-    task_data: dict,
-    current_user: User = Depends(get_current_user)
-):
-    """Create a trigger task via sensor service"""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "http://sensor-service:8001/trigger-tasks",
-                json=task_data,
-                params={"user_id": current_user.id}
-            )
-            if response.status_code != 201:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to create trigger task"
-                )
-            return response.json()
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Sensor service unavailable: {str(e)}")
+for path, methods in SENSOR_PROXY_ROUTES:
+    app.add_api_route(path, proxy_sensor_service, methods=methods)
 
-@app.put("/trigger-tasks/{task_id}")
-async def update_trigger_task(
-    task_id: int,
-    task_data: dict,
-    current_user: User = Depends(get_current_user)
-):
-    """Update a trigger task via sensor service"""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                f"http://sensor-service:8001/trigger-tasks/{task_id}",
-                json=task_data,
-                params={"user_id": current_user.id}
-            )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to update trigger task"
-                )
-            return response.json()
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Sensor service unavailable: {str(e)}")
+SENSOR_BATCH_ROUTES = [
+    (method, compile_path(path)[0]) for path, methods in SENSOR_PROXY_ROUTES for method in methods
+]
+MAX_BATCH_REQUESTS = 20
 
-@app.delete("/trigger-tasks/{task_id}")
-async def delete_trigger_task(
-    task_id: int,
-    current_user: User = Depends(get_current_user)
-):
-    """Delete a trigger task via sensor service"""
+async def run_batch_item(request: Request, current_user: UserLite, item: BatchRequestItem):
+    method = item.method.upper()
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"http://sensor-service:8001/trigger-tasks/{task_id}",
-                params={"user_id": current_user.id}
-            )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to delete trigger task"
-                )
-            return response.json()
+        url = httpx.URL(item.url)
+        if method == "GET" and url.path == "/weather":
+            weather = await get_weather(request, url.params.get("city", "London"), current_user)
+            return {"id": item.id, "status": 200, "body": weather.model_dump()}
+        if not any(method == route_method and pattern.match(url.path) for route_method, pattern in SENSOR_BATCH_ROUTES):
+            return {"id": item.id, "status": 404, "body": {"detail": "Not Found"}}
+        client = request.app.state.http
+        content = orjson.dumps(item.body) if item.body is not None else b""
+        # url.path is already percent-decoded; the proxy needs the path as sent, without its query
+        raw_path = url.raw_path.split(b"?", 1)[0].decode("ascii")
+        upstream_request = build_sensor_request(
+            client, method, raw_path, url.params, current_user.id, content
+        )
+        response = await client.send(upstream_request)
+    except httpx.InvalidURL as e:
+        return {"id": item.id, "status": 400, "body": {"detail": f"Invalid URL: {str(e)}"}}
+    except HTTPException as e:
+        return {"id": item.id, "status": e.status_code, "body": {"detail": e.detail}}
     except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Sensor service unavailable: {str(e)}")
+        return {"id": item.id, "status": 503, "body": {"detail": f"Sensor service unavailable: {str(e)}"}}
+    # Embed upstream JSON verbatim rather than parsing it again; anything else (empty bodies, plain-text
+    # errors) must not be spliced in raw or the whole batch response stops being valid JSON
+    if not response.content:
+        body = None
+    elif response.headers.get("content-type", "").startswith("application/json"):
+        body = orjson.Fragment(response.content)
+    else:
+        body = upstream_error_detail(response)
+    return {"id": item.id, "status": response.status_code, "body": body}
 
-@app.post("/trigger-tasks/{task_id}/evaluate")
-async def evaluate_trigger_task(
-    task_id: int,
-    weather_data: dict,
-    current_user: User = Depends(get_current_user)
+@app.post("/batch")
+async def batch(
+    request: Request,
+    batch_data: BatchRequest,
+    current_user: UserLite = Depends(get_current_user)
 ):
-    """Evaluate a trigger task via sensor service"""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"http://sensor-service:8001/trigger-tasks/{task_id}/evaluate",
-                json=weather_data
-            )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to evaluate trigger task"
-                )
-            return response.json()
-    except httpx.RequestError:
-        raise HTTPException(status_code=503, detail="Sensor service unavailable")
+    """Run several API calls concurrently with a single token check and round-trip"""
+    if len(batch_data.requests) > MAX_BATCH_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"A batch may contain at most {MAX_BATCH_REQUESTS} requests")
+    responses = await asyncio.gather(
+        *(run_batch_item(request, current_user, item) for item in batch_data.requests)
+    )
+    return ORJSONResponse({"responses": responses})
 
 @app.get("/health")
 def health_check():
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import Any, List, Optional
 from datetime import datetime
 
 class UserCreate(BaseModel):
@@ -13,8 +13,7 @@ class UserResponse(BaseModel):
     email: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Token(BaseModel):
     access_token: str
@@ -27,6 +26,9 @@ class WeatherResponse(BaseModel):
     humidity: int
     wind_speed: float
 
+    # Frozen because cached instances are shared across requests
+    model_config = ConfigDict(frozen=True)
+
 class SensorResponse(BaseModel):
     id: int
     name: str
@@ -35,6 +37,13 @@ class SensorResponse(BaseModel):
     unit: str
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+class BatchRequestItem(BaseModel):
+    id: str
+    method: str
+    url: str
+    body: Optional[Any] = None
 
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem]
@@ -0,0 +1,18 @@
+from passlib.context import CryptContext
+
+# Kept free of app/database imports so process pool workers can load it cheaply.
+# Argon2id with OWASP's 46 MiB / t=2 / p=1 profile; bcrypt stays only to verify (and migrate) older hashes.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    argon2__memory_cost=47104,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+    deprecated="auto",
+)
+
+def verify_and_update_password(plain_password, hashed_password):
+    """Return (valid, new_hash); new_hash is set when the stored hash uses a deprecated scheme"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def get_password_hash(password: str):
+    return pwd_context.hash(password)
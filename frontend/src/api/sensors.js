@@ -65,3 +65,10 @@ export const evaluateTriggerTask = async (taskId, weatherData) => {
     const response = await apiClient.post(`/trigger-tasks/${taskId}/evaluate`, weatherData);
     return response.data;
 };
+
+export const evaluateTriggerTasks = async (fieldId, weatherData) => {
+    const response = await apiClient.post('/trigger-tasks/evaluate', weatherData, {
+        params: { field_id: fieldId },
+    });
+    return response.data;
+};
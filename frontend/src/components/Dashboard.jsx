@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { getWeather } from '../api/weather';
-import { getFields, getTriggerTasks, evaluateTriggerTask } from '../api/sensors';
+import { getFields, evaluateTriggerTasks } from '../api/sensors';
 import { useAuth } from '../contexts/AuthContext';
 import WeatherDisplay from './WeatherDisplay';
 import FieldsDisplay from './FieldsDisplay';
@@ -39,33 +39,26 @@ const Dashboard = () => {
     useEffect(() => {
         if (weather && selectedFieldId) {
             const evaluateTriggers = async () => {
-                try {
-                    const tasks = await getTriggerTasks(selectedFieldId);
-                    const activeTasks = tasks.filter((task) => task.is_active);
-
-                    console.log(`Evaluating ${activeTasks.length} active trigger(s) for field ${selectedFieldId}`);
-                    console.log('Current weather:', weather);
+                const weatherData = {
+                    temperature: weather.temperature,
+                    humidity: weather.humidity,
+                    wind_speed: weather.wind_speed,
+                };
 
-                    for (const task of activeTasks) {
-                        const weatherData = {
-                            temperature: weather.temperature,
-                            humidity: weather.humidity,
-                            wind_speed: weather.wind_speed,
-                        };
+                console.log(`Evaluating active triggers for field ${selectedFieldId}`);
+                console.log('Current weather:', weather);
 
-                        try {
-                            const result = await evaluateTriggerTask(task.id, weatherData);
-                            console.log(`Trigger ${task.id} (${task.name}):`, result);
+                try {
+                    const results = await evaluateTriggerTasks(selectedFieldId, weatherData);
+                    for (const result of results) {
+                        console.log(`Trigger ${result.task_id}:`, result);
+                    }
 
-                            if (result.triggered) {
-                                queryClient.invalidateQueries(['fields']);
-                            }
-                        } catch (err) {
-                            console.error(`Error evaluating trigger task ${task.id}:`, err);
-                        }
+                    if (results.some((result) => result.triggered)) {
+                        queryClient.invalidateQueries(['fields']);
                     }
                 } catch (err) {
-                    console.error('Error fetching trigger tasks:', err);
+                    console.error('Error evaluating trigger tasks:', err);
                 }
             };
 
@@ -0,0 +1,89 @@
+import os
+from typing import Dict, List, Optional
+
+import redis.asyncio as redis
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Matches the sensor generator interval, so cached readings are never more than one tick old
+CACHE_TTL_SECONDS = 10
+
+# Precomputed /fields payloads outlive one tick so there is no gap before the next refresh lands
+FIELDS_PRECOMPUTE_TTL_SECONDS = 15
+
+PUMPS_KEY = "pumps:all"
+
+# Bumped on every invalidation; only needs to outlive the time it takes to build one payload
+VERSION_TTL_SECONDS = 3600
+
+# An unreachable Redis must fail fast into the miss path rather than stall requests and scheduler ticks
+REDIS_TIMEOUT_SECONDS = float(os.getenv("REDIS_TIMEOUT_SECONDS", "1"))
+
+redis_client = redis.from_url(
+    REDIS_URL, socket_connect_timeout=REDIS_TIMEOUT_SECONDS, socket_timeout=REDIS_TIMEOUT_SECONDS
+)
+
+# KEYS holds (cache key, version key) pairs, ARGV the TTL followed by (payload, expected version) pairs
+_put_if_unchanged_script = redis_client.register_script("""
+for i = 1, #KEYS, 2 do
+    if (redis.call('GET', KEYS[i + 1]) or '') == ARGV[i + 2] then
+        redis.call('SET', KEYS[i], ARGV[i + 1], 'EX', ARGV[1])
+    end
+end
+""")
+
+def fields_key(user_id: int) -> str:
+    return f"fields:{user_id}"
+
+def version_key(key: str) -> str:
+    return f"{key}:version"
+
+# Cache failures are logged and treated as misses so a Redis outage only costs latency
+
+async def get(key: str) -> Optional[bytes]:
+    try:
+        return await redis_client.get(key)
+    except redis.RedisError as e:
+        print(f"Cache read failed for {key}: {e}")
+        return None
+
+async def versions(keys: List[str]) -> Optional[Dict[str, bytes]]:
+    """Snapshot the invalidation version of each key; take it before reading the data to be cached"""
+    try:
+        values = await redis_client.mget([version_key(key) for key in keys]) if keys else []
+    except redis.RedisError as e:
+        print(f"Cache version read failed for {len(keys)} keys: {e}")
+        return None
+    return {key: value or b"" for key, value in zip(keys, values)}
+
+async def put_if_unchanged(values: Dict[str, bytes], snapshot: Optional[Dict[str, bytes]], ttl: int = CACHE_TTL_SECONDS):
+    """Write each payload only if its key was not invalidated since snapshot was taken, so a payload
+    built from rows read before a concurrent write never overwrites that write's invalidation"""
+    if snapshot is None:
+        return
+    keys, args = [], [ttl]
+    for key, value in values.items():
+        if key in snapshot:
+            keys += [key, version_key(key)]
+            args += [value, snapshot[key]]
+    if not keys:
+        return
+    try:
+        await _put_if_unchanged_script(keys=keys, args=args, client=redis_client)
+    except redis.RedisError as e:
+        print(f"Cache write failed for {len(keys) // 2} keys: {e}")
+
+async def invalidate(*keys: str):
+    # MULTI so no conditional write can land between the delete and the version bump
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.delete(*keys)
+            for key in keys:
+                pipe.incr(version_key(key))
+                pipe.expire(version_key(key), VERSION_TTL_SECONDS)
+            await pipe.execute()
+    except redis.RedisError as e:
+        print(f"Cache invalidation failed for {keys}: {e}")
+
+async def close():
+    await redis_client.aclose()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -16,11 +16,14 @@ class Field(Base):
     
     checkpoints = relationship("Checkpoint", back_populates="field", cascade="all, delete-orphan")
 
+    # Field names are unique per user; enforced here so create/update need no pre-check query
+    __table_args__ = (UniqueConstraint("name", "user_id", name="uq_field_name_user"),)
+
 class Checkpoint(Base):
     __tablename__ = "checkpoints"
 
     id = Column(Integer, primary_key=True, index=True)
-    field_id = Column(Integer, ForeignKey("fields.id"), nullable=False)
+    field_id = Column(Integer, ForeignKey("fields.id"), nullable=False, index=True)
     name = Column(String, nullable=False)  # e.g., "Checkpoint A", "Checkpoint B"
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -40,6 +43,9 @@ class Sensor(Base):
     
     checkpoint = relationship("Checkpoint", back_populates="sensors")
 
+    # One current reading per sensor type; also the conflict target for the generator's upsert
+    __table_args__ = (UniqueConstraint("checkpoint_id", "sensor_type", name="uq_sensor_checkpoint_type"),)
+
 class Pump(Base):
     __tablename__ = "pumps"
 
@@ -57,7 +63,7 @@ class TriggerTask(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    field_id = Column(Integer, ForeignKey("fields.id"), nullable=False)
+    field_id = Column(Integer, ForeignKey("fields.id"), nullable=False, index=True)
     weather_metric = Column(String, nullable=False)  # temperature, humidity, wind_speed
     condition = Column(String, nullable=False)  # greater_than, less_than, equals
     threshold = Column(Float, nullable=False)
@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# SQL statements executed in the current context, or None when nobody is counting
+_statements: ContextVar[Optional[List[str]]] = ContextVar("statements", default=None)
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    statements = _statements.get()
+    if statements is not None:
+        statements.append(statement)
+
+def install(engine: AsyncEngine):
+    """Record statements run through engine while a count_queries() block is active; safe to call twice"""
+    if not event.contains(engine.sync_engine, "before_cursor_execute", _record_statement):
+        event.listen(engine.sync_engine, "before_cursor_execute", _record_statement)
+
+@contextmanager
+def count_queries() -> Iterator[List[str]]:
+    """Collect every SQL statement executed inside the block, including in tasks it spawns"""
+    statements: List[str] = []
+    token = _statements.set(statements)
+    try:
+        yield statements
+    finally:
+        _statements.reset(token)
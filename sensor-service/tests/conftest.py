@@ -0,0 +1,31 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# main reads DATABASE_URL at import, so point it at the test database before any test imports it
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "requires_database: needs TEST_DATABASE_URL to point at a disposable PostgreSQL database")
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="TEST_DATABASE_URL is not set")
+    for item in items:
+        if "requires_database" in item.keywords:
+            item.add_marker(skip)
+
+@pytest.fixture
+def count_queries():
+    """query_counter.count_queries with the listener installed on the service engine"""
+    import main
+    import query_counter
+    query_counter.install(main.engine)
+    return query_counter.count_queries
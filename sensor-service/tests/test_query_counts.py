@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from sqlalchemy import delete, select
+
+# Well clear of any real user so the seeded rows can be removed without touching other data
+TEST_USER_ID = 987_654_321
+
+async def seed_fields(db, fields: int, checkpoints_per_field: int):
+    from main import create_sensors_for_checkpoint
+    from models import Checkpoint, Field, Pump
+    for i in range(fields):
+        field = Field(name=f"Field {i}", city="Dublin", user_id=TEST_USER_ID)
+        db.add(field)
+        await db.flush()
+        for j in range(checkpoints_per_field):
+            checkpoint = Checkpoint(name=f"Checkpoint {j}", field_id=field.id)
+            db.add(checkpoint)
+            await db.flush()
+            db.add_all([*create_sensors_for_checkpoint(checkpoint.id), Pump(checkpoint_id=checkpoint.id, name=f"Pump {j}")])
+    await db.commit()
+
+async def remove_seeded(db):
+    from models import Checkpoint, Field, Pump, Sensor
+    field_ids = select(Field.id).where(Field.user_id == TEST_USER_ID)
+    checkpoint_ids = select(Checkpoint.id).where(Checkpoint.field_id.in_(field_ids))
+    await db.execute(delete(Sensor).where(Sensor.checkpoint_id.in_(checkpoint_ids)))
+    await db.execute(delete(Pump).where(Pump.checkpoint_id.in_(checkpoint_ids)))
+    await db.execute(delete(Checkpoint).where(Checkpoint.field_id.in_(field_ids)))
+    await db.execute(delete(Field).where(Field.user_id == TEST_USER_ID))
+    await db.commit()
+
+@pytest.mark.requires_database
+def test_build_fields_tree_query_count_is_independent_of_size(count_queries):
+    import main
+    from models import Base
+
+    async def run():
+        async with main.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with main.SessionLocal() as db:
+            await remove_seeded(db)
+            await seed_fields(db, fields=5, checkpoints_per_field=5)
+            try:
+                with count_queries() as statements:
+                    fields = (await main.build_fields_tree(db, TEST_USER_ID))[TEST_USER_ID]
+            finally:
+                await remove_seeded(db)
+        await main.engine.dispose()
+        return statements, fields
+
+    statements, fields = asyncio.run(run())
+    assert len(fields) == 5
+    assert sum(len(field["checkpoints"]) for field in fields) == 25
+    assert all(len(checkpoint["sensors"]) == 4 and checkpoint["pump"] for field in fields for checkpoint in field["checkpoints"])
+    # Fields, checkpoints with pumps, sensors; zero would mean the counter itself stopped recording
+    assert len(statements) == 3, statements